@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Shared configuration for the daily analysis scripts."""
+import os
+import time
+from datetime import date, datetime
+
+# Repo root (scripts/analysis/ -> scripts/ -> root)
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DATA_DIR = os.path.join(BASE_DIR, 'data')
+RAW_DATA_DIR = os.path.join(DATA_DIR, 'raw')
+PROCESSED_DATA_DIR = os.path.join(DATA_DIR, 'processed')
+
+TODAY = date.today().isoformat()
+
+# Per-day output folders, created once at import instead of per fetcher
+# instance.
+FINNHUB_DIR = os.path.join(RAW_DATA_DIR, 'finnhub', TODAY)
+GROK_DIR = os.path.join(RAW_DATA_DIR, 'grok', TODAY)
+os.makedirs(FINNHUB_DIR, exist_ok=True)
+os.makedirs(GROK_DIR, exist_ok=True)
+
+def atomic_symlink(target, link):
+    """Swap `link` to point at `target` without a window where it's missing."""
+    tmp = link + '.tmp'
+    try:
+        os.remove(tmp)
+    except FileNotFoundError:
+        pass
+    os.symlink(target, tmp)
+    os.replace(tmp, link)
+
+
+_now_bucket = [0, '']
+
+
+def now_iso():
+    """Current time as an ISO string, recomputed at most once per second."""
+    t = int(time.time())
+    if t != _now_bucket[0]:
+        _now_bucket[0] = t
+        _now_bucket[1] = datetime.fromtimestamp(t).isoformat()
+    return _now_bucket[1]
+
+# Finnhub (free tier: 60 requests/minute)
+FINNHUB_API_KEY = os.environ.get('FINNHUB_API_KEY', '')
+FINNHUB_BASE_URL = 'https://finnhub.io/api/v1'
+FINNHUB_RATE_LIMIT = 60  # requests per minute
+FINNHUB_MAX_CONCURRENCY = 10
+
+# Grok (x.ai) for sentiment/momentum research
+GROK_API_KEY = os.environ.get('GROK_API_KEY', '')
+GROK_BASE_URL = 'https://api.x.ai/v1'
+GROK_MODEL = 'grok-2-latest'
+
+CANDLE_LOOKBACK_DAYS = 30
+
+# 'csv' (default) or 'parquet' — parquet needs pyarrow installed and is
+# the better choice when the analysis stage is the only consumer.
+OUTPUT_FORMAT = os.environ.get('ANALYSIS_OUTPUT_FORMAT', 'csv')
+
+# On-disk response cache so dev re-runs skip the network entirely.
+# Quotes go stale fast; candles are final after the close; profiles
+# barely move.
+CACHE_DIR = os.path.join(BASE_DIR, '.http_cache')
+QUOTE_CACHE_TTL = 5 * 60
+CANDLE_CACHE_TTL = 24 * 60 * 60
+PROFILE_CACHE_TTL = 30 * 24 * 60 * 60
+SENTIMENT_CACHE_TTL = 24 * 60 * 60
+
+# Test universe while the pipeline is validated; swap for the full
+# S&P 500 list (app/constants/sp500.ts) once rate limits are proven out.
+SYMBOLS = [
+    'AAPL', 'MSFT', 'AMZN', 'GOOGL', 'TSLA',
+    'NVDA', 'META', 'BRK.B', 'JPM', 'V',
+    'UNH', 'XOM', 'JNJ', 'WMT', 'PG',
+    'MA', 'HD', 'CVX', 'LLY', 'ABBV',
+]
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""Fetch news sentiment and momentum signals from Grok (x.ai).
+
+Sentiment and momentum are asked for together, several symbols per chat
+completion, so a 20-symbol run costs 4 LLM round trips instead of 40.
+"""
+import csv
+import functools
+import io
+import json
+import logging
+import os
+from operator import itemgetter
+
+import orjson  # type: ignore
+import requests  # type: ignore
+from requests.adapters import HTTPAdapter, Retry  # type: ignore
+
+from config import (
+    CACHE_DIR,
+    GROK_API_KEY,
+    GROK_BASE_URL,
+    GROK_DIR,
+    GROK_MODEL,
+    RAW_DATA_DIR,
+    SENTIMENT_CACHE_TTL,
+    TODAY,
+    atomic_symlink,
+    now_iso,
+)
+from http_cache import DiskCache
+
+logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+_cache = DiskCache(CACHE_DIR)
+
+BATCH_SIZE = 5
+
+# CSV schemas, with one C-level itemgetter per file instead of a chain
+# of dict.get calls per row. Defaults are inserted when the result dicts
+# are built, so the getters can't KeyError.
+_SENTIMENT_FIELDS = ('symbol', 'timestamp', 'score', 'label', 'confidence',
+                     'summary', 'key_topics')
+_MOMENTUM_FIELDS = ('symbol', 'timestamp', 'direction', 'strength',
+                    'timeframe', 'catalysts')
+_SENTIMENT_DEFAULTS = {'score': 0, 'label': '', 'confidence': 0,
+                       'summary': '', 'key_topics': []}
+_MOMENTUM_DEFAULTS = {'direction': '', 'strength': 0, 'timeframe': '',
+                      'catalysts': []}
+_get_sentiment = itemgetter(*_SENTIMENT_FIELDS[:-1])
+_get_momentum = itemgetter(*_MOMENTUM_FIELDS[:-1])
+
+# 1MB userland buffer so each CSV reaches the kernel in one write.
+_open_csv = functools.partial(open, mode='w', newline='', buffering=1 << 20)
+
+_json_decoder = json.JSONDecoder()
+
+
+def _extract_json(text):
+    """Parse the first JSON value in `text`, wherever it starts.
+
+    raw_decode parses in place from an offset, so fenced, bare and
+    prose-wrapped replies are all handled in one linear scan with no
+    substring slicing or fence matching.
+    """
+    for i, ch in enumerate(text):
+        if ch in '{[':
+            try:
+                value, _ = _json_decoder.raw_decode(text, i)
+                return value
+            except ValueError:
+                continue
+    return None
+
+_BATCH_PROMPT = """For each of these stock symbols: {symbols}
+
+Give today's news sentiment and price momentum read. Respond with only a JSON object:
+{{"results": [
+  {{"symbol": "...",
+    "sentiment": {{"score": -1.0 to 1.0, "label": "bearish|neutral|bullish",
+                   "confidence": 0 to 1, "summary": "one sentence",
+                   "key_topics": ["..."]}},
+    "momentum": {{"direction": "up|flat|down", "strength": 0 to 1,
+                  "timeframe": "short|medium|long", "catalysts": ["..."]}}
+  }}
+]}}
+One entry per symbol, in the same order."""
+
+
+class GrokFetcher:
+    """Pulls per-symbol sentiment and momentum into daily CSVs."""
+
+    def __init__(self):
+        self.data_dir = GROK_DIR
+        self.session = requests.Session()
+        # One pooled, kept-alive TLS connection to api.x.ai: saves a full
+        # handshake per completion, and retries transient 429/5xx replies
+        # with backoff instead of failing the batch.
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=8,
+            max_retries=Retry(total=3, backoff_factor=0.3,
+                              status_forcelist=(429, 500, 502, 503, 504),
+                              allowed_methods=frozenset(['GET', 'POST'])))
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'Authorization': f"Bearer {GROK_API_KEY}",
+            'Content-Type': 'application/json',
+            'Accept-Encoding': 'gzip',
+            'Connection': 'keep-alive',
+        })
+
+    def _chat(self, prompt, max_tokens=1500):
+        # Stream the completion: tokens are consumed as Grok emits them,
+        # so a batch's reply is fully assembled the moment generation
+        # ends instead of after the closing of a buffered response body.
+        payload = {
+            'model': GROK_MODEL,
+            'messages': [{'role': 'user', 'content': prompt}],
+            'temperature': 0.2,
+            'max_tokens': max_tokens,
+            'stream': True,
+        }
+        parts = []
+        with self.session.post(f"{GROK_BASE_URL}/chat/completions",
+                               json=payload, timeout=120, stream=True) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line.startswith(b'data: '):
+                    continue
+                data = line[6:]
+                if data == b'[DONE]':
+                    break
+                chunk = orjson.loads(data)
+                # Usage/terminal frames come with an empty choices array.
+                choices = chunk.get('choices')
+                if not choices:
+                    continue
+                content = choices[0].get('delta', {}).get('content')
+                if content:
+                    parts.append(content)
+        return ''.join(parts)
+
+    def analyze_batch(self, symbols):
+        """One chat completion covering sentiment + momentum for all symbols."""
+        prompt = _BATCH_PROMPT.format(symbols=', '.join(symbols))
+        content = self._chat(prompt, max_tokens=300 * len(symbols))
+        parsed = _extract_json(content)
+        if not isinstance(parsed, dict):
+            logger.warning("No JSON object in Grok response for %s", symbols)
+            return []
+        return parsed.get('results', [])
+
+    def fetch_all(self, symbols, save=True):
+        timestamp = now_iso()
+        sentiments, momentums = [], []
+        pending = []
+
+        for symbol in symbols:
+            cached = _cache.get(f"grok:{symbol}:{TODAY}")
+            if cached is not None:
+                sentiments.append(cached['sentiment'])
+                momentums.append(cached['momentum'])
+            else:
+                pending.append(symbol)
+
+        for start in range(0, len(pending), BATCH_SIZE):
+            chunk = pending[start:start + BATCH_SIZE]
+            for result in self.analyze_batch(chunk):
+                symbol = result.get('symbol')
+                if not symbol:
+                    continue
+                sentiment = dict(_SENTIMENT_DEFAULTS)
+                sentiment.update(result.get('sentiment', {}))
+                sentiment.update(symbol=symbol, timestamp=timestamp)
+                momentum = dict(_MOMENTUM_DEFAULTS)
+                momentum.update(result.get('momentum', {}))
+                momentum.update(symbol=symbol, timestamp=timestamp)
+                sentiments.append(sentiment)
+                momentums.append(momentum)
+                _cache.set(f"grok:{symbol}:{TODAY}",
+                           {'sentiment': sentiment, 'momentum': momentum},
+                           SENTIMENT_CACHE_TTL)
+            logger.debug("Analyzed %s", ', '.join(chunk))
+
+        # save=False hands the rows back unsaved, for shard workers
+        # whose caller writes the merged files once.
+        if save:
+            self.save_sentiment_csv(sentiments)
+            self.save_momentum_csv(momentums)
+            self._update_latest_link()
+            logger.info("Grok: %d sentiment, %d momentum rows saved to %s",
+                        len(sentiments), len(momentums), self.data_dir)
+        return {'sentiments': sentiments, 'momentums': momentums}
+
+    def save_sentiment_csv(self, sentiments):
+        # Summaries and topic lists contain commas, so keep csv quoting —
+        # but build the whole file in a StringIO and write it once.
+        filepath = os.path.join(self.data_dir, 'sentiment.csv')
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        writer.writerow(_SENTIMENT_FIELDS)
+        writer.writerows(
+            _get_sentiment(s) + (orjson.dumps(s['key_topics']).decode(),)
+            for s in sentiments)
+        with _open_csv(filepath) as f:
+            f.write(buf.getvalue())
+
+    def save_momentum_csv(self, momentums):
+        filepath = os.path.join(self.data_dir, 'momentum.csv')
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        writer.writerow(_MOMENTUM_FIELDS)
+        writer.writerows(
+            _get_momentum(m) + (orjson.dumps(m['catalysts']).decode(),)
+            for m in momentums)
+        with _open_csv(filepath) as f:
+            f.write(buf.getvalue())
+
+    def _update_latest_link(self):
+        """Point data/raw/grok/latest at today's folder."""
+        atomic_symlink(self.data_dir, os.path.join(RAW_DATA_DIR, 'grok', 'latest'))
+
+
+if __name__ == "__main__":
+    from config import SYMBOLS
+    GrokFetcher().fetch_all(SYMBOLS)
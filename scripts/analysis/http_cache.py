@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""Tiny file-backed response cache: one JSON file per key with a TTL."""
+import json
+import os
+import time
+
+
+class DiskCache:
+    """Stores JSON-serializable values under sanitized key filenames."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        safe = key.replace('/', '_').replace(':', '_')
+        return os.path.join(self.directory, safe + '.json')
+
+    def get(self, key):
+        """Return the cached value, or None if missing or expired."""
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get('expires', 0) < time.time():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return entry.get('value')
+
+    def set(self, key, value, ttl):
+        entry = {'expires': time.time() + ttl, 'value': value}
+        with open(self._path(key), 'w') as f:
+            json.dump(entry, f)
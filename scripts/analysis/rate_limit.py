@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""Token-bucket rate limiter for asyncio fetch pipelines."""
+import asyncio
+import time
+
+
+class AsyncTokenBucket:
+    """Allows `rate` acquisitions per `per` seconds, bursting up to the
+    full budget; callers only sleep once the budget is actually spent."""
+
+    def __init__(self, rate, per):
+        self.capacity = rate
+        self.per = per
+        self.tokens = float(rate)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity,
+                          self.tokens + (now - self.updated) * (self.capacity / self.per))
+        self.updated = now
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) * (self.per / self.capacity))
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Daily data fetch driver: pulls the raw inputs for the analysis pipeline."""
+import argparse
+import logging
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+
+from config import FINNHUB_MAX_CONCURRENCY, FINNHUB_RATE_LIMIT, SYMBOLS
+from finnhub_fetcher import FinnhubFetcher
+from grok_fetcher import GrokFetcher
+
+
+def _chunk(symbols, jobs):
+    size = -(-len(symbols) // jobs)
+    return [symbols[i:i + size] for i in range(0, len(symbols), size)]
+
+
+# Shard workers are module-level so multiprocessing can pickle them;
+# each process builds its own fetcher and returns its slice unsaved.
+# Each shard gets 1/jobs of the Finnhub budget so the combined request
+# rate across processes still honors the 60/min free-tier quota.
+
+def _finnhub_shard(args):
+    symbols, force, jobs = args
+    fetcher = FinnhubFetcher(
+        rate_limit=max(FINNHUB_RATE_LIMIT // jobs, 1),
+        max_concurrency=max(FINNHUB_MAX_CONCURRENCY // jobs, 1))
+    return fetcher.fetch_all(symbols, force=force, save=False)
+
+
+def _grok_shard(symbols):
+    return GrokFetcher().fetch_all(symbols, save=False)
+
+
+def _fetch_finnhub_sharded(symbols, force, jobs, pool):
+    with pool:
+        shards = pool.map(_finnhub_shard,
+                          [(c, force, jobs) for c in _chunk(symbols, jobs)])
+    quotes = [q for shard in shards for q in shard['quotes']]
+    profiles = [p for shard in shards for p in shard['profiles']]
+    fetcher = FinnhubFetcher()
+    fetcher.save_quotes_csv(quotes)
+    fetcher.save_candles([cd for shard in shards for cd in shard['candles']])
+    fetcher.save_profiles_csv(profiles)
+    fetcher._update_latest_link()
+    return {'quotes': quotes,
+            'candle_rows': sum(shard['candle_rows'] for shard in shards),
+            'profiles': profiles}
+
+
+def _fetch_grok_sharded(symbols, jobs, pool):
+    with pool:
+        shards = pool.map(_grok_shard, _chunk(symbols, jobs))
+    sentiments = [s for shard in shards for s in shard['sentiments']]
+    momentums = [m for shard in shards for m in shard['momentums']]
+    fetcher = GrokFetcher()
+    fetcher.save_sentiment_csv(sentiments)
+    fetcher.save_momentum_csv(momentums)
+    fetcher._update_latest_link()
+    return {'sentiments': sentiments, 'momentums': momentums}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fetch daily market data')
+    parser.add_argument('--finnhub', action='store_true',
+                        help='fetch only Finnhub data')
+    parser.add_argument('--grok', action='store_true',
+                        help='fetch only Grok sentiment/momentum')
+    parser.add_argument('--symbols', nargs='*', default=None,
+                        help='override the configured symbol list')
+    parser.add_argument('--force', action='store_true',
+                        help='refetch even if today\'s outputs are fresh')
+    parser.add_argument('--jobs', type=int, default=1,
+                        help='shard the symbol list across N processes, '
+                             'splitting the API rate budget between them')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    symbols = args.symbols or SYMBOLS
+    fetch_finnhub = args.finnhub or not args.grok
+    fetch_grok = args.grok or not args.finnhub
+    logging.info("Fetching data for %d symbols...", len(symbols))
+
+    # The two fetchers hit different APIs with separate rate limits and
+    # spend their time waiting on the network, so run them side by side:
+    # wall time is max(finnhub, grok) instead of their sum.
+    jobs = max(args.jobs, 1)
+    # Fork the worker pools before any threads exist: forking from a
+    # multi-threaded process is a deadlock hazard (and deprecated on
+    # 3.12+), so the pools can't be created inside the executor threads.
+    finnhub_pool = grok_pool = None
+    if jobs > 1:
+        if fetch_finnhub:
+            finnhub_pool = multiprocessing.Pool(jobs)
+        if fetch_grok:
+            grok_pool = multiprocessing.Pool(jobs)
+
+    futures = {}
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        if fetch_finnhub:
+            if jobs > 1:
+                futures['finnhub'] = pool.submit(
+                    _fetch_finnhub_sharded, symbols, args.force, jobs,
+                    finnhub_pool)
+            else:
+                futures['finnhub'] = pool.submit(
+                    FinnhubFetcher().fetch_all, symbols, force=args.force)
+        if fetch_grok:
+            if jobs > 1:
+                futures['grok'] = pool.submit(
+                    _fetch_grok_sharded, symbols, jobs, grok_pool)
+            else:
+                futures['grok'] = pool.submit(GrokFetcher().fetch_all, symbols)
+    return {name: future.result() for name, future in futures.items()}
+
+
+if __name__ == "__main__":
+    main()
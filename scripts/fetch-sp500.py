@@ -1,46 +1,86 @@
 #!/usr/bin/env python3
+import io
+import json
+import os
+import sys
+import time
+
+import pandas as pd  # type: ignore
 import requests  # type: ignore
-from bs4 import BeautifulSoup  # type: ignore
+
+CACHE_PATH = os.path.expanduser('~/.cache/sp500.json')
+CACHE_TTL = 7 * 86400  # constituents change a handful of times a year
+
+def _read_cache():
+    try:
+        with open(CACHE_PATH) as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    # A malformed cache falls through to a refetch instead of crashing.
+    if isinstance(cached, dict) and isinstance(cached.get('stocks'), list):
+        return cached
+    return None
+
+def _write_cache(payload):
+    os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+    with open(CACHE_PATH, 'w') as f:
+        json.dump(payload, f)
 
 def fetch_sp500_list():
     """Fetch the complete S&P 500 list from Wikipedia"""
+    # A week-old cached copy is current enough, and turns repeat runs
+    # into a local JSON read instead of a network fetch + HTML parse.
+    cached = _read_cache()
+    try:
+        fresh = time.time() - os.path.getmtime(CACHE_PATH) < CACHE_TTL
+    except OSError:
+        fresh = False
+    if cached and fresh:
+        return cached['stocks']
+
     url = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
-    
-    response = requests.get(url)
-    soup = BeautifulSoup(response.text, 'html.parser')
-    
-    # Find the main table
-    table = soup.find('table', {'id': 'constituents'})
-    if not table:
-        table = soup.find('table', {'class': 'wikitable sortable'})
-    
-    stocks = []
-    
-    # Parse table rows
-    rows = table.find_all('tr')[1:]  # Skip header row
-    
-    for row in rows:
-        cols = row.find_all('td')
-        if len(cols) >= 3:
-            # Extract symbol, name, and sector
-            symbol = cols[0].text.strip()
-            name = cols[1].text.strip()
-            sector = cols[3].text.strip() if len(cols) > 3 else 'Unknown'
-            
-            stocks.append({
-                'symbol': symbol,
-                'name': name,
-                'sector': sector
-            })
-    
+
+    session = requests.Session()
+    session.headers.update({
+        'Accept-Encoding': 'gzip',
+        'User-Agent': 'sp500-fetch/1.0',
+    })
+    headers = {}
+    if cached and cached.get('etag'):
+        headers['If-None-Match'] = cached['etag']
+    response = session.get(url, headers=headers, timeout=10)
+
+    # 304 Not Modified: the table hasn't changed since the cached parse,
+    # so re-stamp the cache and reuse it — ~2KB of traffic, no reparse.
+    if response.status_code == 304 and cached:
+        _write_cache(cached)
+        return cached['stocks']
+    response.raise_for_status()
+
+    # lxml's C parser pulls the whole constituents table in one call
+    table = pd.read_html(io.StringIO(response.text),
+                         attrs={'id': 'constituents'}, flavor='lxml')[0]
+
+    stocks = [
+        {'symbol': symbol, 'name': name, 'sector': sector}
+        for symbol, name, sector in zip(
+            table['Symbol'], table['Security'], table['GICS Sector'])
+    ]
+
+    _write_cache({'etag': response.headers.get('ETag'), 'stocks': stocks})
+
     return stocks
 
 if __name__ == "__main__":
     stocks = fetch_sp500_list()
-    
-    # Print TypeScript format
-    print("export const SP500 = [")
-    for stock in stocks:
-        print(f"  {{ symbol: '{stock['symbol']}', name: '{stock['name']}', sector: '{stock['sector']}' }},")
-    print("];")
-    print(f"\n// Total: {len(stocks)} stocks")
\ No newline at end of file
+
+    # Print TypeScript format — built in memory and flushed with one
+    # write instead of a locked, flushing print per stock.
+    lines = ["export const SP500 = ["]
+    lines += [
+        f"  {{ symbol: '{s['symbol']}', name: '{s['name']}', sector: '{s['sector']}' }},"
+        for s in stocks
+    ]
+    lines += ["];", f"\n// Total: {len(stocks)} stocks"]
+    sys.stdout.write('\n'.join(lines) + '\n')
\ No newline at end of file